@@ -1,16 +1,22 @@
 """MaestroCat - Enhanced voice agent framework built on Pipecat"""
 
-from .services import (
-    WhisperLiveSTTService,
-    OLLamaLLMService,
-    KokoroTTSService,
-)
+import importlib
 
-__all__ = [
-    "WhisperLiveSTTService",
-    "OLLamaLLMService",
-    "KokoroTTSService",
-]
+# Service classes are resolved lazily (PEP 562) so that `import core`
+# doesn't drag in pipecat/httpx/websockets when the caller only needs
+# the config or state utilities
+_LAZY_IMPORTS = {
+    "WhisperLiveSTTService": "core.services.whisperlive_stt",
+    "OLLamaLLMService": "core.services.ollama_llm",
+    "KokoroTTSService": "core.services.kokoro_tts",
+}
 
+__all__ = list(_LAZY_IMPORTS)
 
 
+def __getattr__(name):
+    try:
+        module = importlib.import_module(_LAZY_IMPORTS[name])
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    return getattr(module, name)
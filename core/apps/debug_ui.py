@@ -7,7 +7,8 @@ Provides real-time monitoring and configuration
 import asyncio
 import json
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from collections import deque
+from itertools import islice
 import logging
 import os
 
@@ -20,6 +21,19 @@ import uvicorn
 from ..processors.event_emitter import EventEmitter
 from ..utils.config import MaestroCatConfig
 
+# orjson is ~5-10x faster than stdlib json for encoding; fall back to
+# stdlib if it isn't installed
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    orjson = None
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="MaestroCat Debug UI")
@@ -38,24 +52,63 @@ if os.path.exists(ui_dir):
 
 class ConnectionManager:
     """Manages WebSocket connections for real-time updates"""
-    
+
+    # Per-client send queue depth; when a slow client falls this far
+    # behind, its oldest frames are dropped rather than stalling others
+    CLIENT_QUEUE_SIZE = 256
+
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        
+        self.active_connections: Dict[WebSocket, asyncio.Queue] = {}
+        self._writer_tasks: Dict[WebSocket, asyncio.Task] = {}
+
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
-        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.CLIENT_QUEUE_SIZE)
+        self.active_connections[websocket] = queue
+        self._writer_tasks[websocket] = asyncio.create_task(
+            self._client_writer(websocket, queue)
+        )
+
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-        
+        self.active_connections.pop(websocket, None)
+        task = self._writer_tasks.pop(websocket, None)
+        if task:
+            task.cancel()
+
     async def broadcast(self, message: dict):
-        """Send message to all connected clients"""
-        for connection in self.active_connections:
+        """Queue message for all connected clients"""
+        if not self.active_connections:
+            return
+
+        # Serialize once instead of once per connection
+        payload = _json_dumps(message)
+
+        for queue in self.active_connections.values():
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                # Drop the oldest frame to make room for the newest
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+                queue.put_nowait(payload)
+
+    async def _client_writer(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Drain one client's queue and push payloads over its socket"""
+        try:
+            while True:
+                payload = await queue.get()
+                await websocket.send_bytes(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Socket is gone; drop the connection and close our side so
+            # the fd doesn't linger
+            self.disconnect(websocket)
             try:
-                await connection.send_json(message)
-            except:
-                # Connection might be closed
+                await websocket.close()
+            except Exception:
                 pass
 
 
@@ -71,51 +124,72 @@ class ConfigUpdate(BaseModel):
 class DebugUIServer:
     """Debug UI server that integrates with MaestroCat pipeline"""
     
+    # Maximum events coalesced into one WebSocket frame
+    BROADCAST_MAX_BATCH = 256
+
     def __init__(self, port: int = 8080):
         self.port = port
         self.event_emitter: Optional[EventEmitter] = None
         self.config: Optional[MaestroCatConfig] = None
-        self.metrics_history = []
-        self.event_history = []
-        
+        # Bounded ring buffers: append + evict are O(1), unlike list.pop(0)
+        self.metrics_history = deque(maxlen=50)
+        self.event_history = deque(maxlen=1000)
+        self._out_queue: asyncio.Queue = asyncio.Queue()
+        self._broadcast_task: Optional[asyncio.Task] = None
+
     def attach_event_emitter(self, event_emitter: EventEmitter):
         """Attach to pipeline's event emitter"""
         self.event_emitter = event_emitter
-        
-        # Subscribe to all events
+
+        # Type-specific handler skips the per-event type check; the
+        # wildcard handler just records and queues for broadcast
+        self.event_emitter.subscribe("metrics_update", self._on_metrics)
         self.event_emitter.subscribe("*", self._handle_event)
-        
+
     def attach_config(self, config: MaestroCatConfig):
         """Attach configuration"""
         self.config = config
-        
-    async def _handle_event(self, event: dict):
-        """Handle events from the pipeline"""
-        # Store in history
+
+    def _handle_event(self, event: dict):
+        """Handle any pipeline event (sync, so dispatch skips an await)"""
+        # Store in history (deque evicts the oldest entry automatically)
         self.event_history.append(event)
-        if len(self.event_history) > 1000:
-            self.event_history.pop(0)
-            
-        # Special handling for metrics
-        if event["type"] == "metrics_update":
-            self.metrics_history.append({
-                "timestamp": event["timestamp"],
-                "data": event["data"]
-            })
-            
-        # Broadcast to connected clients
-        await manager.broadcast({
-            "type": "event",
-            "event": event
+
+        # Queue for the broadcast loop, which coalesces bursts of events
+        # into a single WebSocket frame
+        self._out_queue.put_nowait(event)
+
+    def _on_metrics(self, event: dict):
+        """Handle metrics_update events"""
+        self.metrics_history.append({
+            "timestamp": event["timestamp"],
+            "data": event["data"]
         })
-        
+
+    async def _broadcast_loop(self):
+        """Drain queued events and broadcast them as batched frames"""
+        while True:
+            first = await self._out_queue.get()
+            batch = [first]
+            while len(batch) < self.BROADCAST_MAX_BATCH and not self._out_queue.empty():
+                batch.append(self._out_queue.get_nowait())
+            await manager.broadcast({
+                "type": "batch",
+                "events": batch
+            })
+
     async def start(self):
         """Start the debug UI server"""
+        self._broadcast_task = asyncio.create_task(self._broadcast_loop())
         config = uvicorn.Config(
             app,
             host="0.0.0.0",
             port=self.port,
-            log_level="info"
+            log_level="info",
+            # Per-message deflate would re-compress the shared broadcast
+            # payload once per connection; the payloads are small and
+            # local, so skip it and send the same bytes to every client
+            ws_per_message_deflate=False
         )
         server = uvicorn.Server(config)
         await server.serve()
@@ -147,13 +221,31 @@ async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
     
     try:
-        # Send initial state
-        await websocket.send_json({
+        # Send initial state in several small frames rather than one
+        # giant JSON blob, so encoding and the kernel TCP writes overlap
+        await websocket.send_bytes(_json_dumps({
             "type": "initial_state",
-            "config": debug_server.config.to_dict() if debug_server.config else {},
-            "event_history": debug_server.event_history[-100:],  # Last 100 events
-            "metrics_history": debug_server.metrics_history[-50:]  # Last 50 metrics
-        })
+            "config": debug_server.config.to_dict() if debug_server.config else {}
+        }))
+
+        # Deques only support slicing via islice; take the newest entries
+        recent_events = list(islice(
+            debug_server.event_history,
+            max(0, len(debug_server.event_history) - 100),
+            len(debug_server.event_history)
+        ))
+        for start in range(0, len(recent_events), 25):
+            await websocket.send_bytes(_json_dumps({
+                "type": "batch",
+                "events": recent_events[start:start + 25]
+            }))
+
+        recent_metrics = list(debug_server.metrics_history)
+        for start in range(0, len(recent_metrics), 25):
+            await websocket.send_bytes(_json_dumps({
+                "type": "initial_metrics",
+                "metrics": recent_metrics[start:start + 25]
+            }))
         
         while True:
             # Receive messages from client
@@ -179,10 +271,10 @@ async def websocket_endpoint(websocket: WebSocket):
                 # Send event history
                 since = data.get("since", 0)
                 events = [e for e in debug_server.event_history if e["timestamp"] > since]
-                await websocket.send_json({
+                await websocket.send_bytes(_json_dumps({
                     "type": "event_history",
                     "events": events
-                })
+                }))
                 
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -370,14 +462,18 @@ debug_ui_html = """
         
         function connect() {
             ws = new WebSocket('ws://localhost:8080/ws');
-            
+            // The server sends binary frames; without this they arrive as Blobs
+            ws.binaryType = 'arraybuffer';
+
             ws.onopen = () => {
                 console.log('Connected to MaestroCat Debug UI');
             };
-            
+
             ws.onmessage = (event) => {
-                const data = JSON.parse(event.data);
-                handleMessage(data);
+                const text = typeof event.data === 'string'
+                    ? event.data
+                    : new TextDecoder().decode(event.data);
+                handleMessage(JSON.parse(text));
             };
             
             ws.onclose = () => {
@@ -391,9 +487,16 @@ debug_ui_html = """
                 case 'event':
                     handleEvent(data.event);
                     break;
+                case 'batch':
+                    data.events.forEach(event => handleEvent(event));
+                    break;
                 case 'initial_state':
                     updateUI(data);
                     break;
+                case 'initial_metrics':
+                    // Replay history chunks; the gauges end up showing the newest
+                    data.metrics.forEach(entry => updateMetrics(entry.data));
+                    break;
             }
         }
         
@@ -463,8 +566,11 @@ debug_ui_html = """
                 // Update config UI
             }
             
-            // Replay recent events
-            state.event_history.forEach(event => handleEvent(event));
+            // Replay recent events (history now arrives as separate
+            // batch frames, so this field may be absent)
+            if (state.event_history) {
+                state.event_history.forEach(event => handleEvent(event));
+            }
         }
         
         // Config change handlers
@@ -2,121 +2,236 @@
 """Memory module for conversation history and context"""
 from typing import Dict, Any, List, Optional
 from collections import deque
+import asyncio
 import json
+import logging
+import mmap
 import os
+import re
 
 from core.modules.base import MaestroCatModule
 
+logger = logging.getLogger(__name__)
+
+# Single-pass fact extraction: group 1 captures a name, group 2 a preference
+_FACT_RE = re.compile(
+    r"\bmy name is (\w+)|\bi like (.+?)(?:[.!?]|$)",
+    re.IGNORECASE
+)
+
 
 class MemoryModule(MaestroCatModule):
     """
     Memory module that stores conversation history
     and provides context enrichment
     """
-    
+
     def __init__(self, name: str, config: Dict[str, Any]):
         super().__init__(name, config)
-        
+
         self.max_history = config.get("max_history", 100)
         self.save_to_disk = config.get("save_to_disk", False)
         self.memory_file = config.get("memory_file", "conversation_memory.json")
-        
-        # Memory storage
-        self.short_term = deque(maxlen=self.max_history)
+
+        # Memory storage. A caller that already keeps conversation
+        # history (e.g. pipeline state) can pass its deque as
+        # config["shared_history"] so the turns aren't stored twice.
+        shared = config.get("shared_history")
+        self.short_term = shared if shared is not None else deque(maxlen=self.max_history)
         self.long_term = {}
         self.user_facts = {}
-        
+        self._saving = False
+
+        # Records waiting to be appended to the on-disk log
+        self._pending_records: List[Dict[str, Any]] = []
+        self._log_lines = 0
+        # The loop holds only weak refs to tasks; keep save tasks alive
+        # here until they finish so a write can't be collected mid-flight
+        self._save_tasks = set()
+
         # Load existing memory if available
         if self.save_to_disk and os.path.exists(self.memory_file):
             self._load_memory()
-            
+
     async def on_event(self, event_type: str, data: Any):
         """Process events to build memory"""
+        entry = None
+
         if event_type == "transcription_complete":
-            # Store user utterance
-            self.short_term.append({
+            # Store user utterance (lowercase cached once for search)
+            text = data.get("text", "")
+            entry = {
                 "type": "user",
-                "text": data.get("text", ""),
+                "text": text,
+                "_text_lower": text.lower(),
                 "timestamp": data.get("timestamp"),
                 "metadata": data
-            })
-            
+            }
+            self.short_term.append(entry)
+
             # Extract facts (simple keyword extraction for demo)
-            await self._extract_facts(data.get("text", ""))
-            
+            if await self._extract_facts(text):
+                # Snapshot at enqueue time: the save thread serializes
+                # this record while the loop may keep mutating the live
+                # dict and its nested likes list
+                facts = dict(self.user_facts)
+                if "likes" in facts:
+                    facts["likes"] = list(facts["likes"])
+                self._pending_records.append({
+                    "kind": "facts",
+                    "user_facts": facts
+                })
+
         elif event_type == "llm_response_complete":
             # Store assistant response
-            self.short_term.append({
-                "type": "assistant", 
-                "text": data.get("text", ""),
+            text = data.get("text", "")
+            entry = {
+                "type": "assistant",
+                "text": text,
+                "_text_lower": text.lower(),
                 "timestamp": data.get("timestamp")
-            })
-            
-        # Periodically save to disk
-        if self.save_to_disk and len(self.short_term) % 10 == 0:
-            self._save_memory()
-            
-    async def _extract_facts(self, text: str):
-        """Extract facts from user utterances"""
+            }
+            self.short_term.append(entry)
+
+        # Append only the new records to the on-disk log, off-loop
+        if self.save_to_disk and entry is not None:
+            self._pending_records.append({"kind": "turn", "entry": entry})
+            task = asyncio.create_task(self._save_memory())
+            self._save_tasks.add(task)
+            task.add_done_callback(self._save_tasks.discard)
+
+    async def _extract_facts(self, text: str) -> bool:
+        """Extract facts from user utterances; returns True if any found"""
         # Simple extraction for demo
         # In production, use NLP/NER
-        
-        text_lower = text.lower()
-        
-        # Extract name
-        if "my name is" in text_lower:
-            name = text.split("my name is")[-1].strip().split()[0]
-            self.user_facts["name"] = name
-            
-        # Extract preferences
-        if "i like" in text_lower:
-            like = text.split("i like")[-1].strip()
-            if "likes" not in self.user_facts:
-                self.user_facts["likes"] = []
-            self.user_facts["likes"].append(like)
-            
+
+        # One compiled-regex pass instead of repeated lower()/split()
+        found = False
+        for match in _FACT_RE.finditer(text):
+            if match[1]:
+                self.user_facts["name"] = match[1]
+                found = True
+            elif match[2]:
+                self.user_facts.setdefault("likes", []).append(match[2].strip())
+                found = True
+        return found
+
     def get_context(self, num_turns: int = 5) -> Dict[str, Any]:
         """Get relevant context for LLM"""
         recent_history = list(self.short_term)[-num_turns:]
-        
+
         return {
             "recent_history": recent_history,
             "user_facts": self.user_facts,
             "conversation_length": len(self.short_term)
         }
-        
+
     def search_memory(self, query: str) -> List[Dict]:
         """Search through conversation history"""
-        results = []
+        # Plain `in` on the lowercase text cached at append time runs
+        # CPython's C substring search with no per-entry allocation
         query_lower = query.lower()
-        
-        for memory in self.short_term:
-            if query_lower in memory.get("text", "").lower():
-                results.append(memory)
-                
-        return results
-        
-    def _save_memory(self):
-        """Save memory to disk"""
-        memory_data = {
-            "short_term": list(self.short_term),
-            "user_facts": self.user_facts,
-            "long_term": self.long_term
-        }
-        
-        with open(self.memory_file, "w") as f:
-            json.dump(memory_data, f)
-            
+
+        return [
+            memory for memory in self.short_term
+            if query_lower in (memory.get("_text_lower") or memory.get("text", "").lower())
+        ]
+
+    async def _save_memory(self):
+        """Append pending records to the on-disk log"""
+        # Skip if a previous save is still in flight; the next save
+        # will pick up the pending records
+        if self._saving or not self._pending_records:
+            return
+        self._saving = True
+
+        try:
+            records, self._pending_records = self._pending_records, []
+            # Snapshot mutable state on the loop before offloading: the
+            # worker thread must not iterate live containers the loop
+            # may append to concurrently
+            snapshot = (
+                list(self.short_term),
+                dict(self.user_facts),
+                dict(self.long_term),
+            )
+            # Offload the blocking encode + write to a thread
+            await asyncio.to_thread(self._append_to_log, records, snapshot)
+        finally:
+            self._saving = False
+
+    def _append_to_log(self, records: List[Dict[str, Any]], snapshot: tuple):
+        """Blocking append, run in a worker thread"""
+        lines = b"".join(
+            json.dumps(record).encode("utf-8") + b"\n" for record in records
+        )
+        with open(self.memory_file, "ab") as f:
+            f.write(lines)
+        self._log_lines += len(records)
+
+        # Compact once the log grows well past what we keep in memory,
+        # so replay on startup stays bounded
+        if self._log_lines > self.max_history * 10:
+            self._compact_log(*snapshot)
+
+    def _compact_log(self, short_term: List[Dict], user_facts: Dict, long_term: Dict):
+        """Rewrite the log as a snapshot of the state captured on the loop"""
+        records = [{"kind": "turn", "entry": entry} for entry in short_term]
+        if user_facts:
+            records.append({"kind": "facts", "user_facts": user_facts})
+        if long_term:
+            records.append({"kind": "long_term", "long_term": long_term})
+
+        tmp_file = self.memory_file + ".tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(b"".join(
+                json.dumps(record).encode("utf-8") + b"\n" for record in records
+            ))
+        os.replace(tmp_file, self.memory_file)
+        self._log_lines = len(records)
+
     def _load_memory(self):
-        """Load memory from disk"""
+        """Load memory from disk by replaying the append-only log"""
         try:
-            with open(self.memory_file, "r") as f:
-                memory_data = json.load(f)
-                
-            self.short_term = deque(memory_data.get("short_term", []), maxlen=self.max_history)
-            self.user_facts = memory_data.get("user_facts", {})
-            self.long_term = memory_data.get("long_term", {})
-            
+            with open(self.memory_file, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    first = mm.readline()
+                    if not first.strip():
+                        return
+
+                    record = json.loads(first)
+                    if "short_term" in record:
+                        # Legacy whole-file snapshot format. Mutate the
+                        # existing deque rather than rebinding it, which
+                        # would sever a caller's shared_history alias
+                        self.short_term.clear()
+                        self.short_term.extend(record.get("short_term", []))
+                        self.user_facts = record.get("user_facts", {})
+                        self.long_term = record.get("long_term", {})
+                        self._log_lines += 1
+                    else:
+                        self._apply_record(record)
+
+                    # Replay whatever follows the first line — saves
+                    # append JSONL records to the file regardless of
+                    # which format it started in
+                    for line in iter(mm.readline, b""):
+                        self._apply_record(json.loads(line))
+
+            # Older entries may predate the cached lowercase field
+            for entry in self.short_term:
+                entry.setdefault("_text_lower", entry.get("text", "").lower())
+
         except Exception as e:
             logger.error(f"Failed to load memory: {e}")
 
+    def _apply_record(self, record: Dict[str, Any]):
+        """Apply one log record to in-memory state"""
+        kind = record.get("kind")
+        if kind == "turn":
+            self.short_term.append(record.get("entry", {}))
+        elif kind == "facts":
+            self.user_facts = record.get("user_facts", {})
+        elif kind == "long_term":
+            self.long_term = record.get("long_term", {})
+        self._log_lines += 1
@@ -1,42 +1,84 @@
 # maestrocat/modules/voice_recognition.py
 """Voice recognition module example"""
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import logging
 import numpy as np
 from core.modules.base import MaestroCatModule
 
+# Numba compiles the fingerprint kernel to machine code (cached on
+# disk); without it the numpy version is still fully vectorized
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+
+def _audio_fingerprint(samples: np.ndarray) -> np.ndarray:
+    """Cheap audio summary (RMS + zero-crossing rate) used as a
+    placeholder for real speaker embeddings"""
+    rms = np.sqrt(np.mean(samples * samples))
+    crossings = np.sum((samples[1:] * samples[:-1]) < 0.0)
+    out = np.empty(2, dtype=np.float32)
+    out[0] = rms
+    out[1] = crossings / max(samples.size - 1, 1)
+    return out
+
+
+if njit is not None:
+    _audio_fingerprint = njit(cache=True, fastmath=True)(_audio_fingerprint)
+
 
 class VoiceRecognitionModule(MaestroCatModule):
     """
     Example voice recognition module
     In production, would use speaker embeddings
     """
-    
+
     def __init__(self, name: str, config: Dict[str, Any]):
         super().__init__(name, config)
         self.known_voices = {}
         self.current_speaker = None
-        
+        self.last_fingerprint: Optional[np.ndarray] = None
+
     async def on_event(self, event_type: str, data: Any):
         """Handle pipeline events"""
         if event_type == "audio_processed":
             # In production: extract speaker embeddings
             # For now, just mock it
             speaker_id = self._mock_identify_speaker(data)
-            
+
             if speaker_id != self.current_speaker:
                 self.current_speaker = speaker_id
                 logger.info(f"Speaker changed to: {speaker_id}")
-                
+
         elif event_type == "transcription_complete":
             # Attach speaker info to transcription
             if self.current_speaker:
                 data["speaker_id"] = self.current_speaker
-                
+
     def _mock_identify_speaker(self, audio_data: Any) -> str:
         """Mock speaker identification"""
-        # In production: use speaker embedding model
+        # In production: match the fingerprint against known_voices
+        samples = self._as_samples(audio_data)
+        if samples is not None and samples.size > 1:
+            self.last_fingerprint = _audio_fingerprint(samples)
         return "user_1"
-        
+
+    @staticmethod
+    def _as_samples(audio_data: Any) -> Optional[np.ndarray]:
+        """Coerce event audio payloads to a contiguous float32 array"""
+        if isinstance(audio_data, dict):
+            audio_data = audio_data.get("audio")
+        if audio_data is None:
+            return None
+        if isinstance(audio_data, (bytes, bytearray)):
+            samples = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
+        else:
+            samples = np.ascontiguousarray(audio_data, dtype=np.float32)
+        return samples
+
     async def register_voice(self, name: str, audio_samples: list):
         """Register a new voice"""
         # In production: compute and store embeddings
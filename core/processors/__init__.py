@@ -1,13 +1,14 @@
 # core/processors/__init__.py
 """MaestroCat processors module"""
 
-from .interruption import InterruptionHandler, MetricsCollector
+from .interruption import InterruptionHandler, InterruptTTSFrame, MetricsCollector
 from .event_emitter import EventEmitter
 from .module_loader import ModuleLoader
 
 __all__ = [
     'InterruptionHandler',
-    'MetricsCollector', 
+    'InterruptTTSFrame',
+    'MetricsCollector',
     'EventEmitter',
     'ModuleLoader'
 ]
\ No newline at end of file
@@ -1,14 +1,36 @@
 # maestrocat/processors/event_emitter.py
 """Enhanced event system for Pipecat pipelines"""
 import asyncio
+import sys
 from typing import Dict, Any, List, Optional, Callable
-from collections import defaultdict, deque
+from collections import deque
 import time
 import logging
 
-from pipecat.frames.frames import Frame, SystemFrame, TextFrame, StartFrame, EndFrame
+from pipecat.frames.frames import (
+    Frame,
+    SystemFrame,
+    TextFrame,
+    StartFrame,
+    EndFrame,
+    InputAudioRawFrame,
+    OutputAudioRawFrame,
+    TTSAudioRawFrame,
+)
 from pipecat.processors.frame_processor import FrameProcessor, FrameDirection
 
+# orjson encodes event payloads several times faster than stdlib json;
+# fall back to stdlib if it isn't installed
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:
+    import json
+
+    _dumps = json.dumps
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,22 +49,34 @@ class EventEmitter(FrameProcessor):
         self.buffer_size = buffer_size
         self.emit_as_frames = emit_as_frames
         
-        # Event handling
-        self._subscribers: Dict[str, List[Callable]] = defaultdict(list)
+        # Event handling. Inner dicts act as ordered sets: O(1)
+        # add/remove, insertion-ordered iteration, and re-subscribing
+        # the same callback is idempotent. Callbacks are classified
+        # sync/async once here instead of on every emit.
+        self._sync_subs: Dict[str, Dict[Callable, None]] = {}
+        self._async_subs: Dict[str, Dict[Callable, None]] = {}
         self._event_buffer = deque(maxlen=buffer_size)
+        # Per-type index so typed history queries don't scan the buffer
+        self._by_type: Dict[str, deque] = {}
         self._event_count = 0
-        
+
     def subscribe(self, event_type: str, callback: Callable):
         """Subscribe to an event type"""
-        self._subscribers[event_type].append(callback)
-        
+        # Interned keys make the per-emit dict lookups pointer compares
+        event_type = sys.intern(event_type)
+        if asyncio.iscoroutinefunction(callback):
+            self._async_subs.setdefault(event_type, {})[callback] = None
+        else:
+            self._sync_subs.setdefault(event_type, {})[callback] = None
+
     def unsubscribe(self, event_type: str, callback: Callable):
         """Unsubscribe from an event type"""
-        if callback in self._subscribers[event_type]:
-            self._subscribers[event_type].remove(callback)
+        self._sync_subs.get(event_type, {}).pop(callback, None)
+        self._async_subs.get(event_type, {}).pop(callback, None)
             
     async def emit(self, event_type: str, data: Any):
         """Emit an event"""
+        event_type = sys.intern(event_type)
         event = {
             "type": event_type,
             "data": data,
@@ -52,26 +86,56 @@ class EventEmitter(FrameProcessor):
         
         self._event_count += 1
         self._event_buffer.append(event)
+
+        bucket = self._by_type.get(event_type)
+        if bucket is None:
+            bucket = self._by_type[event_type] = deque(maxlen=self.buffer_size)
+        bucket.append(event)
         
-        # Call subscribers
-        for callback in self._subscribers[event_type]:
+        # Sync subscribers run in a tight loop; async ones run
+        # concurrently instead of being awaited one after another.
+        # Wildcard ("*") subscribers are just another bucket, so
+        # dispatching them is two extra dict lookups, not a scan.
+        for callback in self._sync_subs.get(event_type, ()):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Error in event callback: {e}")
+        for callback in self._sync_subs.get("*", ()):
             try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(event)
-                else:
-                    callback(event)
+                callback(event)
             except Exception as e:
                 logger.error(f"Error in event callback: {e}")
-                
+
+        coros = []
+        async_subs = self._async_subs.get(event_type)
+        if async_subs:
+            coros.extend(callback(event) for callback in async_subs)
+        async_wild = self._async_subs.get("*")
+        if async_wild:
+            coros.extend(callback(event) for callback in async_wild)
+        if coros:
+            results = await asyncio.gather(*coros, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error in event callback: {result}")
+
         # Emit as frame if enabled
         if self.emit_as_frames:
             # Use TextFrame to carry event data as JSON
-            import json
-            event_data = json.dumps({"type": event_type, "data": data})
+            event_data = _dumps({"type": event_type, "data": data})
             await self.push_frame(TextFrame(event_data))
             
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         """Convert certain frames to events"""
+        # Audio frames dominate the frame stream and never become
+        # events; a single exact-type check gets them through without
+        # walking the isinstance chain below
+        t = type(frame)
+        if t is InputAudioRawFrame or t is OutputAudioRawFrame or t is TTSAudioRawFrame:
+            await self.push_frame(frame, direction)
+            return
+
         # Handle StartFrame/EndFrame properly
         if isinstance(frame, StartFrame):
             await self.emit("pipeline_started", {})
@@ -91,18 +155,25 @@ class EventEmitter(FrameProcessor):
         limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """Get event history with optional filtering"""
-        events = list(self._event_buffer)
-        
-        # Filter by type
-        if event_type:
-            events = [e for e in events if e["type"] == event_type]
-            
-        # Filter by timestamp
+        # Typed queries read the per-type index instead of filtering
+        # the whole buffer
+        source = self._by_type.get(event_type, ()) if event_type else self._event_buffer
+
         if since_timestamp:
-            events = [e for e in events if e["timestamp"] > since_timestamp]
-            
+            # Events are appended in timestamp order, so walk back from
+            # the newest entry and stop at the cutoff — O(matching)
+            # instead of scanning the whole buffer
+            events: List[Dict[str, Any]] = []
+            for event in reversed(source):
+                if event["timestamp"] <= since_timestamp:
+                    break
+                events.append(event)
+            events.reverse()
+        else:
+            events = list(source)
+
         # Limit results
         if limit:
             events = events[-limit:]
-            
+
         return events
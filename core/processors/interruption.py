@@ -2,16 +2,80 @@
 """Smart interruption handler for Pipecat"""
 import time
 import asyncio
-import json
 from typing import Optional, Dict, Any
 import logging
 
+from dataclasses import dataclass
+
 from pipecat.frames.frames import Frame, SystemFrame, TextFrame
 from pipecat.processors.frame_processor import FrameProcessor, FrameDirection
 
+# orjson encodes the metrics payload several times faster than stdlib
+# json; fall back to stdlib if it isn't installed
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:
+    import json
+
+    _dumps = json.dumps
+
 logger = logging.getLogger(__name__)
 
 
+class _CallbackDispatcher:
+    """Runs event callbacks off the frame-processing path.
+
+    Events go through a bounded queue drained by a background task so a
+    slow callback (WebSocket push, metrics write) can't stall
+    push_frame. When the queue is full the event is dropped with a
+    warning instead of blocking the pipeline.
+    """
+
+    QUEUE_SIZE = 256
+
+    def __init__(self, callback: Optional[callable]):
+        self._callback = callback
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def dispatch(self, name: str, data: Dict[str, Any]):
+        """Queue an event for the callback without awaiting it"""
+        if self._callback is None:
+            return
+        if self._queue is None:
+            # Created lazily so construction doesn't need a running loop
+            self._queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+            self._worker = asyncio.create_task(self._run())
+        try:
+            self._queue.put_nowait((name, data))
+        except asyncio.QueueFull:
+            logger.warning("Event callback queue full, dropping %s event", name)
+
+    async def _run(self):
+        while True:
+            name, data = await self._queue.get()
+            try:
+                result = self._callback(name, data)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Error in event callback: {e}")
+
+
+@dataclass
+class InterruptTTSFrame(SystemFrame):
+    """Control frame telling the TTS service to stop output immediately.
+
+    Typed so downstream processors can match with isinstance instead of
+    JSON-parsing every TextFrame.
+    """
+    completion_ratio: float = 0.0
+    preserve_context: bool = False
+
+
 class InterruptionHandler(FrameProcessor):
     """
     Handles interruptions with context preservation
@@ -28,63 +92,83 @@ class InterruptionHandler(FrameProcessor):
         self.threshold = threshold
         self.ack_delay = ack_delay
         self.event_callback = event_callback
+        self._callback_dispatcher = _CallbackDispatcher(event_callback)
         
         # TTS tracking
         self.tts_active = False
         self.tts_start_time = None
         self.tts_duration = None
         self.current_response = ""
-        self.response_tokens = 0
-        
+
+        # Dispatch table keyed by frame name replaces the per-frame
+        # string-compare chain
+        self._sys_handlers = {
+            "tts_started": self._on_tts_started,
+            "tts_stopped": self._on_tts_stopped,
+            "user_started_speaking": self._on_user_started_speaking,
+        }
+
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         """Process frames to detect and handle interruptions"""
-        
-        # Track TTS state
-        if isinstance(frame, SystemFrame):
-            if frame.name == "tts_started":
-                self.tts_active = True
-                self.tts_start_time = time.time()
-                self.tts_duration = frame.data.get("duration", 0) if hasattr(frame, 'data') else 0
-                
-            elif frame.name == "tts_stopped":
-                self.tts_active = False
-                
-            # Handle interruption on new speech
-            elif frame.name == "user_started_speaking" and self.tts_active:
-                await self._handle_interruption()
-                
-        # Track response content
-        elif isinstance(frame, TextFrame) and direction == FrameDirection.DOWNSTREAM:
-            self.current_response = frame.text
-            self.response_tokens = len(frame.text.split())
-            
+
+        # Track response content first — text frames are the common
+        # non-audio case and need only one exact-type check. Word
+        # counts can be derived lazily from current_response if an
+        # interruption ever needs them.
+        if type(frame) is TextFrame:
+            if direction == FrameDirection.DOWNSTREAM:
+                self.current_response = frame.text
+
+        # Track TTS state via the dispatch table
+        elif isinstance(frame, SystemFrame):
+            handler = self._sys_handlers.get(frame.name)
+            if handler:
+                await handler(frame)
+
         await self.push_frame(frame, direction)
-        
+
+    async def _on_tts_started(self, frame: SystemFrame):
+        self.tts_active = True
+        self.tts_start_time = time.monotonic_ns()
+        self.tts_duration = frame.data.get("duration", 0) if hasattr(frame, 'data') else 0
+
+    async def _on_tts_stopped(self, frame: SystemFrame):
+        self.tts_active = False
+
+    async def _on_user_started_speaking(self, frame: SystemFrame):
+        # Handle interruption on new speech
+        if self.tts_active:
+            await self._handle_interruption()
+
     async def _handle_interruption(self):
         """Handle user interruption intelligently"""
         if not self.tts_start_time or not self.tts_duration:
             completion_ratio = 0
+            elapsed_ns = 0
         else:
-            elapsed = time.time() - self.tts_start_time
-            completion_ratio = elapsed / self.tts_duration if self.tts_duration > 0 else 0
+            # Monotonic integer clock: immune to NTP jumps, cheaper
+            # than wall-clock float reads
+            elapsed_ns = time.monotonic_ns() - self.tts_start_time
+            completion_ratio = elapsed_ns / (self.tts_duration * 1e9) if self.tts_duration > 0 else 0
             
         # Determine if we should preserve context
         preserve_context = completion_ratio < self.threshold
         
-        # Stop TTS
-        # Use TextFrame to signal TTS interruption
-        await self.push_frame(TextFrame(json.dumps({"type": "interrupt_tts"})))
+        # Stop TTS with a typed control frame
+        await self.push_frame(InterruptTTSFrame(
+            completion_ratio=completion_ratio,
+            preserve_context=preserve_context
+        ))
         
         # Log interruption
         logger.info(f"Interruption at {completion_ratio:.0%} completion")
         
-        # Emit event if callback provided
-        if self.event_callback:
-            self.event_callback("interruption", {
-                "completion_ratio": completion_ratio,
-                "preserve_context": preserve_context,
-                "elapsed_ms": (time.time() - self.tts_start_time) * 1000
-            })
+        # Emit event off the frame path if callback provided
+        self._callback_dispatcher.dispatch("interruption", {
+            "completion_ratio": completion_ratio,
+            "preserve_context": preserve_context,
+            "elapsed_ms": elapsed_ns / 1e6
+        })
             
         # Add context marker
         context_marker = f"[INTERRUPTED at {completion_ratio:.0%}]" if preserve_context else "[INTERRUPTED]"
@@ -135,50 +219,54 @@ class MetricsCollector(FrameProcessor):
         super().__init__()
         self.emit_interval = emit_interval
         self.event_callback = event_callback
+        self._callback_dispatcher = _CallbackDispatcher(event_callback)
         
         self.metrics = PipelineMetrics()
-        self._component_starts: Dict[str, float] = {}
-        self._last_emit_time = time.time()
+        self._component_starts: Dict[str, int] = {}
+        self._last_emit_time = time.monotonic_ns()
+        # Only consult the clock every Nth frame; with a 10s default
+        # emit interval, per-frame time reads are pure overhead
+        self._emit_check_interval = 256
+        self._frames_since_check = 0
         
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         """Track timing through the pipeline"""
         self.metrics.frames_processed += 1
         
         if isinstance(frame, SystemFrame):
-            # Track component timing
-            if frame.name.endswith("_start"):
-                component = frame.name.replace("_start", "")
-                self._component_starts[component] = time.time()
-                
-            elif frame.name.endswith("_end"):
-                component = frame.name.replace("_end", "")
-                if component in self._component_starts:
-                    latency = (time.time() - self._component_starts[component]) * 1000
+            # Track component timing. Fixed-width slice compares are
+            # cheaper than endswith/replace, and pop() resolves the
+            # start entry with a single dict lookup.
+            name = frame.name
+            if name[-6:] == "_start":
+                self._component_starts[name[:-6]] = time.monotonic_ns()
+
+            elif name[-4:] == "_end":
+                component = name[:-4]
+                start = self._component_starts.pop(component, None)
+                if start is not None:
+                    latency = (time.monotonic_ns() - start) / 1e6
                     self.metrics.component_timings[component] = latency
+
+                    # Update specific metrics; fold the delta into the
+                    # total instead of re-summing all three components
+                    if component in ("stt", "llm", "tts"):
+                        attr = component + "_latency"
+                        self.metrics.total_latency += latency - getattr(self.metrics, attr)
+                        setattr(self.metrics, attr, latency)
                     
-                    # Update specific metrics
-                    if component == "stt":
-                        self.metrics.stt_latency = latency
-                    elif component == "llm":
-                        self.metrics.llm_latency = latency
-                    elif component == "tts":
-                        self.metrics.tts_latency = latency
-                        
-                    # Calculate total
-                    self.metrics.total_latency = sum([
-                        self.metrics.stt_latency,
-                        self.metrics.llm_latency,
-                        self.metrics.tts_latency
-                    ])
-                    
-            elif frame.name == "error":
+            elif name == "error":
                 self.metrics.errors += 1
                 
-        # Emit metrics periodically
-        current_time = time.time()
-        if current_time - self._last_emit_time >= self.emit_interval:
-            await self._emit_metrics()
-            self._last_emit_time = current_time
+        # Emit metrics periodically; component-timing frames also force
+        # a check so emission isn't starved on low frame rates
+        self._frames_since_check += 1
+        if self._frames_since_check >= self._emit_check_interval or isinstance(frame, SystemFrame):
+            self._frames_since_check = 0
+            current_time = time.monotonic_ns()
+            if current_time - self._last_emit_time >= self.emit_interval * 1e9:
+                await self._emit_metrics()
+                self._last_emit_time = current_time
             
         await self.push_frame(frame, direction)
         
@@ -196,11 +284,10 @@ class MetricsCollector(FrameProcessor):
         
         # Emit as system frame
         # Use TextFrame to carry metrics data
-        metrics_json = json.dumps({"type": "metrics_update", "data": metrics_data})
+        metrics_json = _dumps({"type": "metrics_update", "data": metrics_data})
         await self.push_frame(TextFrame(metrics_json))
         
-        # Call event callback if provided
-        if self.event_callback:
-            self.event_callback("metrics", metrics_data)
+        # Call event callback off the frame path if provided
+        self._callback_dispatcher.dispatch("metrics", metrics_data)
             
         logger.info(f"Metrics: {metrics_data}")
@@ -2,6 +2,7 @@
 """Module system for extending pipelines at runtime"""
 from .event_emitter import EventEmitter
 from typing import Dict, Any, List, Optional, Type
+import asyncio
 import logging
 import json
 from abc import ABC, abstractmethod
@@ -44,6 +45,12 @@ class ModuleLoader(FrameProcessor):
         super().__init__()
         self.modules: Dict[str, MaestroCatModule] = {}
         self.event_emitter = event_emitter
+        # Modules that implement process_frame, computed at load/unload
+        # time so the per-frame path skips the hasattr scan
+        self._frame_modules: List[MaestroCatModule] = []
+        # Wildcard subscription handles keyed by module name so unload
+        # removes exactly the callback that was registered
+        self._subscriptions: Dict[str, callable] = {}
         
     async def load_module(
         self,
@@ -62,11 +69,20 @@ class ModuleLoader(FrameProcessor):
             
             # Store module
             self.modules[module_name] = module
-            
-            # Subscribe to events if event emitter provided
+            if hasattr(module, 'process_frame'):
+                self._frame_modules.append(module)
+
+            # Subscribe to events if event emitter provided. The
+            # emitter hands subscribers a single event dict; adapt it
+            # to the module's (event_type, data) signature and keep the
+            # wrapper as the unsubscribe handle.
             if self.event_emitter:
-                self.event_emitter.subscribe("*", module.on_event)
-                
+                async def _forward(event, _module=module):
+                    await _module.on_event(event["type"], event["data"])
+
+                self._subscriptions[module_name] = _forward
+                self.event_emitter.subscribe("*", _forward)
+
             logger.info(f"Loaded module: {module_name}")
             
             # Emit module loaded event
@@ -92,13 +108,16 @@ class ModuleLoader(FrameProcessor):
             # Cleanup
             await module.cleanup()
             
-            # Unsubscribe from events
-            if self.event_emitter:
-                self.event_emitter.unsubscribe("*", module.on_event)
-                
+            # Unsubscribe from events using the stored handle
+            handler = self._subscriptions.pop(module_name, None)
+            if self.event_emitter and handler:
+                self.event_emitter.unsubscribe("*", handler)
+
             # Remove module
             del self.modules[module_name]
-            
+            if module in self._frame_modules:
+                self._frame_modules.remove(module)
+
             logger.info(f"Unloaded module: {module_name}")
             
             # Emit event
@@ -113,11 +132,22 @@ class ModuleLoader(FrameProcessor):
             
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         """Allow modules to process frames"""
-        # Let modules see all frames
-        for module in self.modules.values():
-            if module.enabled and hasattr(module, 'process_frame'):
-                await module.process_frame(frame, direction)
-                
+        # Let modules see all frames; skip the dispatch entirely when
+        # nothing is loaded, which is the common per-frame case.
+        # Modules are independent observers, so fan out concurrently
+        # instead of awaiting them one after another.
+        if self._frame_modules:
+            coros = [
+                module.process_frame(frame, direction)
+                for module in self._frame_modules
+                if module.enabled
+            ]
+            if coros:
+                results = await asyncio.gather(*coros, return_exceptions=True)
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error(f"Error in module process_frame: {result}")
+
         await self.push_frame(frame, direction)
         
     def get_module(self, name: str) -> Optional[MaestroCatModule]:
@@ -1,15 +1,35 @@
 # core/serializers/raw_audio_serializer.py
 """Raw audio serializer for WhisperLive integration"""
-import json
+import logging
+import struct
 import numpy as np
+
+# orjson parses control messages ~2x faster than stdlib json and
+# accepts str or bytes; fall back to stdlib if it isn't installed
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
 from pipecat.frames.frames import InputAudioRawFrame, OutputAudioRawFrame, TTSAudioRawFrame, Frame
 from pipecat.serializers.base_serializer import FrameSerializer, FrameSerializerType
 
+logger = logging.getLogger(__name__)
+
+# Pre-compiled packer for the two per-chunk length fields
+_WAV_SIZE = struct.Struct("<I")
+
 class RawAudioSerializer(FrameSerializer):
     """Serializer that handles raw PCM audio for WhisperLive"""
     
     def __init__(self):
         super().__init__()
+        # Header templates keyed by audio format; only the length
+        # fields change between chunks of the same format
+        self._header_cache: dict[tuple, bytes] = {}
+        # Reusable float32 work buffer for the clip/scale pass, grown
+        # to the largest chunk seen so steady-state serialization does
+        # not allocate a float temp per chunk
+        self._f32_scratch = np.empty(0, dtype=np.float32)
     
     @property
     def type(self) -> FrameSerializerType:
@@ -37,26 +57,31 @@ class RawAudioSerializer(FrameSerializer):
                 try:
                     # Try to interpret as float32
                     audio_np = np.frombuffer(audio_data, dtype=np.float32)
-                    
-                    # Check for invalid values (NaN, infinity)
-                    if np.any(np.isnan(audio_np)) or np.any(np.isinf(audio_np)):
-                        # Skip conversion, treat as raw int16 data
-                        pass
-                    else:
-                        # Ensure values are in valid range [-1, 1] 
-                        audio_np = np.clip(audio_np, -1.0, 1.0)
-                        # Convert to 16-bit PCM for browser compatibility
-                        audio_int16 = (audio_np * 32767.0).astype(np.int16)
+
+                    # One finiteness pass replaces the separate NaN and
+                    # Inf scans; skip conversion on invalid data
+                    if np.isfinite(audio_np).all():
+                        # Clip into the reusable scratch buffer, scale
+                        # in place, then cast once into the int16 output
+                        n = audio_np.shape[0]
+                        if self._f32_scratch.shape[0] < n:
+                            self._f32_scratch = np.empty(n, dtype=np.float32)
+                        scaled = self._f32_scratch[:n]
+                        np.clip(audio_np, -1.0, 1.0, out=scaled)
+                        scaled *= 32767.0
+                        audio_int16 = np.empty(n, dtype=np.int16)
+                        np.copyto(audio_int16, scaled, casting='unsafe')
                         audio_data = audio_int16.tobytes()
                         bits_per_sample = 16
-                        print(f"Converted Float32 to Int16: {len(audio_np)} samples -> {len(audio_data)} bytes")
-                        
+                        logger.debug("Converted Float32 to Int16: %d samples -> %d bytes",
+                                     len(audio_np), len(audio_data))
+
                 except Exception as e:
-                    print(f"Float32 conversion failed: {e}, treating as raw data")
+                    logger.debug("Float32 conversion failed: %s, treating as raw data", e)
                     # If conversion fails, assume it's already int16
                     pass
             else:
-                print(f"Audio data not Float32-sized: {len(audio_data)} bytes")
+                logger.debug("Audio data not Float32-sized: %d bytes", len(audio_data))
             
             # Raw PCM data, add proper WAV header
             return self._add_wav_header(
@@ -69,18 +94,34 @@ class RawAudioSerializer(FrameSerializer):
         # Return None for other frame types
         return None
     
-    def _add_wav_header(self, pcm_data: bytes, sample_rate: int, num_channels: int, bits_per_sample: int) -> bytes:
+    def _add_wav_header(self, pcm_data: bytes, sample_rate: int, num_channels: int, bits_per_sample: int) -> bytearray:
         """Add WAV header to PCM data"""
+        key = (sample_rate, num_channels, bits_per_sample)
+        template = self._header_cache.get(key)
+        if template is None:
+            template = self._build_header_template(sample_rate, num_channels, bits_per_sample)
+            self._header_cache[key] = template
+
+        # Assemble header and PCM in one pre-sized buffer: a single
+        # allocation and one copy of the PCM. Returned as a bytearray
+        # (bytes-like) so the transport can send it without another copy
         data_length = len(pcm_data)
-        
-        # Build WAV header
+        buf = bytearray(44 + data_length)
+        buf[:44] = template
+        _WAV_SIZE.pack_into(buf, 4, data_length + 36)  # file size - 8
+        _WAV_SIZE.pack_into(buf, 40, data_length)
+        buf[44:] = pcm_data
+        return buf
+
+    @staticmethod
+    def _build_header_template(sample_rate: int, num_channels: int, bits_per_sample: int) -> bytes:
+        """Build a 44-byte WAV header with length fields zeroed"""
         header = bytearray(44)
-        
-        # "RIFF" chunk descriptor
+
+        # "RIFF" chunk descriptor (file size patched per chunk)
         header[0:4] = b'RIFF'
-        header[4:8] = (data_length + 36).to_bytes(4, 'little')  # file size - 8
         header[8:12] = b'WAVE'
-        
+
         # "fmt " sub-chunk
         header[12:16] = b'fmt '
         header[16:20] = (16).to_bytes(4, 'little')  # subchunk size
@@ -90,34 +131,30 @@ class RawAudioSerializer(FrameSerializer):
         header[28:32] = (sample_rate * num_channels * (bits_per_sample // 8)).to_bytes(4, 'little')  # byte rate
         header[32:34] = (num_channels * (bits_per_sample // 8)).to_bytes(2, 'little')  # block align
         header[34:36] = bits_per_sample.to_bytes(2, 'little')
-        
-        # "data" sub-chunk
+
+        # "data" sub-chunk (data length patched per chunk)
         header[36:40] = b'data'
-        header[40:44] = data_length.to_bytes(4, 'little')
-        
-        return bytes(header) + pcm_data
+
+        return bytes(header)
         
     async def deserialize(self, data: str | bytes) -> Frame | None:
         """Deserialize WebSocket message to frame"""
-        # Handle binary audio data
-        if isinstance(data, bytes):
-            # Create InputAudioRawFrame from raw PCM data
-            # WhisperLive sends 16kHz mono PCM audio
+        # Binary audio is the per-packet common case: exact type check,
+        # wrap by reference, return. WhisperLive sends 16kHz mono PCM.
+        if type(data) is bytes:
             return InputAudioRawFrame(
                 audio=data,
                 sample_rate=16000,
                 num_channels=1
             )
-        
-        # Handle text messages (for control messages)
-        if isinstance(data, str):
+
+        # Text messages: only attempt a JSON parse when the payload can
+        # actually be a control message, not for arbitrary plain text
+        if type(data) is str and data and data[0] in '{[':
             try:
-                # Try to parse as JSON
-                message = json.loads(data)
+                message = _loads(data)
                 # Return None for now - could handle control messages here
-                return None
-            except json.JSONDecodeError:
-                # Plain text message
-                return None
-                
+            except ValueError:
+                pass
+
         return None
\ No newline at end of file
@@ -1,19 +1,44 @@
 # maestrocat/services/kokoro_tts.py
 """Kokoro TTS Service for Pipecat"""
 import httpx
-import time
 import asyncio
-import numpy as np
+import json
+import struct
 from typing import AsyncGenerator, Optional
 import logging
-import io
-import wave
 
-from pipecat.frames.frames import Frame, TTSAudioRawFrame, SystemFrame
+from pipecat.frames.frames import Frame, TTSAudioRawFrame, SystemFrame, UserStartedSpeakingFrame
+from pipecat.processors.frame_processor import FrameDirection
 from pipecat.services.tts_service import TTSService
 
+from core.processors.interruption import InterruptTTSFrame
+
 logger = logging.getLogger(__name__)
 
+# RIFF descriptor plus canonical fmt chunk (36 bytes), decoded in one
+# precompiled unpack instead of field-by-field slicing
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH')
+
+
+def _make_client() -> httpx.AsyncClient:
+    """Build the shared pooled HTTP client"""
+    kwargs = dict(
+        timeout=httpx.Timeout(30.0, connect=2.0),
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    )
+    try:
+        # HTTP/2 multiplexes concurrent sessions over one connection;
+        # needs the optional 'h2' package
+        return httpx.AsyncClient(http2=True, **kwargs)
+    except ImportError:
+        return httpx.AsyncClient(**kwargs)
+
+
+# One client shared by all service instances so streaming requests
+# reuse warm keep-alive sockets instead of paying TCP setup per
+# utterance. Never closed explicitly; its sockets die with the process.
+_CLIENT = _make_client()
+
 
 class KokoroTTSService(TTSService):
     """
@@ -37,210 +62,268 @@ class KokoroTTSService(TTSService):
         self._speed = speed
         self._sample_rate = sample_rate
         
-        self._client = httpx.AsyncClient(timeout=30.0)
+        self._client = _CLIENT
         self._current_request = None  # Track current request for cancellation
-        self._audio_buffer = b""  # Buffer for accumulating audio chunks
-        self._streaming_buffer = []  # Buffer for smooth audio streaming
-        self._buffer_samples = int(self._sample_rate * 0.02)  # 20ms buffer for smoothing
-        
-    def _resample_audio(self, audio_data: bytes, from_rate: int, to_rate: int) -> bytes:
-        """Resample audio data from one sample rate to another"""
-        if from_rate == to_rate:
-            # Still need to convert to float32 format
-            audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
-            return audio_np.tobytes()
-            
-        # Convert bytes to numpy array (assuming 16-bit PCM)
-        audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
-        
-        # Simple linear interpolation resampling
-        original_length = len(audio_np)
-        new_length = int(original_length * to_rate / from_rate)
-        
-        # Create new sample indices
-        old_indices = np.linspace(0, original_length - 1, original_length)
-        new_indices = np.linspace(0, original_length - 1, new_length)
-        
-        # Interpolate
-        resampled = np.interp(new_indices, old_indices, audio_np)
-        
-        # Return as float32 for PyAudio
-        return resampled.astype(np.float32).tobytes()
-        
-    def _extract_wav_data(self, wav_bytes: bytes) -> tuple[bytes, int]:
-        """Extract PCM data and sample rate from WAV bytes"""
+        self._generation = 0  # Bumped per run_tts so stale streams stop yielding
+        self._pending_closes = set()  # Background aclose tasks, drained in stop()
+
+        # Everything in the request but the input text is invariant, so
+        # serialize it once and splice the text in per utterance
+        self._url = f"{base_url}/v1/audio/speech"
+        invariant = json.dumps({
+            "model": "tts-1-hd",  # Use HD model for better quality
+            "voice": voice,
+            # Raw PCM skips WAV header handling entirely; the rate is
+            # Kokoro's known native 24kHz (self._sample_rate)
+            "response_format": "pcm",
+            "stream": True,
+            "speed": speed,
+            "volume_multiplier": 1.0
+        })
+        self._body_prefix = (invariant[:-1] + ', "input": ').encode("utf-8")
+        self._request_headers = {
+            "Content-Type": "application/json",
+            # Identity encoding guarantees raw WAV/PCM bytes so the
+            # stream can bypass httpx's decoding layer
+            "Accept-Encoding": "identity",
+        }
+        self._cancel_event = asyncio.Event()  # Set on interruption to stop streaming
+        # Target size for coalescing small TCP chunks into ~40ms frames
+        # (int16 mono) so the pipeline isn't driven once per network read
+        self._emit_target = int(self._sample_rate * 0.04) * 2
+
+    @staticmethod
+    async def _pump(response, queue: asyncio.Queue):
+        """Read raw response bytes into the queue, ending with None.
+
+        aiter_raw forwards each TCP segment as it arrives instead of
+        letting the ByteChunker batch them.
+        """
         try:
-            with io.BytesIO(wav_bytes) as wav_io:
-                with wave.open(wav_io, 'rb') as wav_file:
-                    sample_rate = wav_file.getframerate()
-                    pcm_data = wav_file.readframes(wav_file.getnframes())
-                    return pcm_data, sample_rate
+            async for raw in response.aiter_raw():
+                if raw:
+                    await queue.put(raw)
+        finally:
+            await queue.put(None)
+
+    @staticmethod
+    async def _close_quietly(stream):
+        """Close a response stream, ignoring errors but not cancellation"""
+        try:
+            await stream.aclose()
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.warning(f"Failed to parse WAV data: {e}, treating as raw PCM")
-            return wav_bytes, 24000  # Assume Kokoro's default
-    
-    def _add_to_streaming_buffer(self, audio_data: bytes):
-        """Add audio data to streaming buffer for smooth playback"""
-        # Convert to numpy float32 array
-        audio_np = np.frombuffer(audio_data, dtype=np.float32)
-        self._streaming_buffer.extend(audio_np)
-        
-    def _get_buffered_chunk(self, chunk_size: int) -> Optional[bytes]:
-        """Get a chunk from the streaming buffer, return None if not enough data"""
-        if len(self._streaming_buffer) < chunk_size:
+            logger.debug("Ignored error closing TTS stream: %s", e)
+
+    async def start(self, frame: SystemFrame):
+        """Pre-warm the HTTP connection pool"""
+        await super().start(frame)
+        try:
+            # A throwaway request performs the TCP (and TLS/HTTP/2)
+            # handshake now, so the first utterance doesn't pay it
+            await self._client.get(f"{self._base_url}/health", timeout=2.0)
+        except Exception as e:
+            logger.debug("TTS pre-warm request failed: %s", e)
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        """Watch for interruption frames so an in-flight stream stops
+        immediately instead of draining its buffered audio"""
+        if isinstance(frame, (InterruptTTSFrame, UserStartedSpeakingFrame)):
+            self._cancel_event.set()
+        await super().process_frame(frame, direction)
+
+    @staticmethod
+    def _parse_wav_header(buf: bytes) -> Optional[tuple[int, int]]:
+        """Locate the PCM payload of a streamed WAV.
+
+        Returns (sample_rate, data_offset) once enough bytes have
+        arrived, or None while the header is still incomplete or the
+        buffer isn't RIFF data at all.
+        """
+        if len(buf) < 44:
             return None
-            
-        # Extract chunk
-        chunk = np.array(self._streaming_buffer[:chunk_size], dtype=np.float32)
-        self._streaming_buffer = self._streaming_buffer[chunk_size:]
-        
-        # Apply gentle fade in/out to reduce clicks
-        fade_samples = min(64, chunk_size // 8)  # Small fade
-        if fade_samples > 0:
-            # Fade in at start
-            fade_in = np.linspace(0, 1, fade_samples)
-            chunk[:fade_samples] *= fade_in
-            
-            # Fade out at end  
-            fade_out = np.linspace(1, 0, fade_samples)
-            chunk[-fade_samples:] *= fade_out
-            
-        return chunk.tobytes()
-        
-    def _flush_streaming_buffer(self) -> Optional[bytes]:
-        """Flush remaining audio from streaming buffer"""
-        if not self._streaming_buffer:
+        riff, _, wave_id, _, _, _, _, sample_rate, _, _, _ = _WAV_HEADER.unpack_from(buf, 0)
+        if riff != b'RIFF' or wave_id != b'WAVE':
             return None
-            
-        chunk = np.array(self._streaming_buffer, dtype=np.float32)
-        self._streaming_buffer = []
-        
-        # Apply fade out to end
-        fade_samples = min(64, len(chunk) // 4)
-        if fade_samples > 0:
-            fade_out = np.linspace(1, 0, fade_samples)
-            chunk[-fade_samples:] *= fade_out
-            
-        return chunk.tobytes()
-        
+        # LIST or other chunks may precede data; scan past the fmt chunk
+        idx = buf.find(b'data', _WAV_HEADER.size)
+        if idx < 0:
+            return None
+        return sample_rate, idx + 8
+
     async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
         """Generate speech from text"""
         
         try:
             # Cancel any existing request
+            # Close the previous request in the background — awaiting
+            # its read pump to drain here would delay the new synthesis
             if self._current_request:
                 logger.info("Cancelling previous TTS request")
-                try:
-                    await self._current_request.aclose()
-                except:
-                    pass
-            
-            # Prepare OpenAI-compatible request (PCM format for better streaming)
-            request_data = {
-                "model": "tts-1-hd",  # Use HD model for better quality
-                "input": text,
-                "voice": self._voice,
-                "response_format": "wav",  # Request WAV to get proper headers
-                "stream": True,
-                "speed": self._speed,
-                "volume_multiplier": 1.0
-            }
-            
-            # Stream audio
-            self._current_request = self._client.stream(
+                task = asyncio.create_task(self._close_quietly(self._current_request))
+                self._pending_closes.add(task)
+                task.add_done_callback(self._pending_closes.discard)
+                self._current_request = None
+
+            # A stale generator must stop yielding once a newer request
+            # has started, even before its cancellation lands
+            self._generation += 1
+            generation = self._generation
+
+            # Splice the text into the pre-serialized OpenAI-compatible
+            # body instead of rebuilding and re-encoding the whole dict
+            body = (
+                self._body_prefix
+                + json.dumps(text, ensure_ascii=False).encode("utf-8")
+                + b"}"
+            )
+
+            request = self._client.build_request(
                 "POST",
-                f"{self._base_url}/v1/audio/speech",
-                json=request_data
+                self._url,
+                content=body,
+                headers=self._request_headers
             )
-            
-            # Clear buffers for new request
-            self._audio_buffer = b""
-            self._streaming_buffer = []
-            wav_header_parsed = False
-            kokoro_sample_rate = 24000  # Kokoro's native rate
-            
+
+            # Reset the cancellation flag for the new request. The
+            # buffers are generator-local: a superseded run keeps its
+            # own and can never emit or wipe the newer run's audio.
+            self._cancel_event.clear()
+            audio_buffer = bytearray()  # accumulates a sniffed WAV header
+            emit_buf = bytearray()  # coalesces chunks into ~40ms frames
+            kokoro_sample_rate = self._sample_rate  # Kokoro's native rate
+            first_chunk = True
+            wav_pending = False
+            loop = asyncio.get_running_loop()
+            last_emit = loop.time()
+
+            response = await self._client.send(request, stream=True)
+            self._current_request = response
             try:
-                async with self._current_request as response:
-                    response.raise_for_status()
-                    
-                    async for chunk in response.aiter_bytes():
-                        if chunk:
-                            self._audio_buffer += chunk
-                            
-                            # Try to parse WAV header from accumulated buffer
-                            if not wav_header_parsed and len(self._audio_buffer) > 44:
-                                try:
-                                    pcm_data, kokoro_sample_rate = self._extract_wav_data(self._audio_buffer)
-                                    wav_header_parsed = True
-                                    
-                                    # Process the PCM data
-                                    if pcm_data:
-                                        # No resampling needed - keep native 24kHz
-                                        frame = TTSAudioRawFrame(
-                                            audio=pcm_data,
-                                            sample_rate=kokoro_sample_rate,  # Use original rate
-                                            num_channels=1
-                                        )
-                                        yield frame
-                                        
-                                    # Clear buffer after processing complete WAV
-                                    self._audio_buffer = b""
-                                except Exception as e:
-                                    # If WAV parsing fails, continue accumulating
-                                    logger.debug(f"WAV parsing not ready yet: {e}")
-                                    pass
-                            
-                            # If we have a very large buffer but no WAV header, process as raw
-                            elif len(self._audio_buffer) > 8192 and not wav_header_parsed:
-                                logger.warning("Large buffer without WAV header, processing as raw PCM")
-                                # Assume it's raw PCM at Kokoro's rate
-                                if kokoro_sample_rate != self._sample_rate:
-                                    processed_audio = self._resample_audio(self._audio_buffer, kokoro_sample_rate, self._sample_rate)
-                                else:
-                                    processed_audio = self._audio_buffer
-                                
-                                # Simple direct output for now to restore audio
-                                frame = TTSAudioRawFrame(
-                                    audio=self._audio_buffer,
-                                    sample_rate=kokoro_sample_rate,  # Use original rate
+                response.raise_for_status()
+
+                # Decouple socket reads from frame emission: a pump
+                # task keeps draining the response while this
+                # coroutine builds and yields frames, so network
+                # I/O overlaps the Python-side work. The bounded
+                # queue applies backpressure if emission lags.
+                queue: asyncio.Queue = asyncio.Queue(maxsize=32)
+                pump = asyncio.create_task(self._pump(response, queue))
+                try:
+                    while True:
+                        chunk = await queue.get()
+                        if chunk is None:
+                            await pump  # surface read errors
+                            break
+                        if generation != self._generation:
+                            logger.debug("TTS stream superseded, stopping")
+                            await response.aclose()
+                            audio_buffer.clear()
+                            emit_buf.clear()
+                            break
+                        if self._cancel_event.is_set():
+                            logger.info("TTS stream interrupted, closing response")
+                            await response.aclose()
+                            audio_buffer.clear()
+                            emit_buf.clear()
+                            break
+                        # Defensive: some servers answer a "pcm"
+                        # request with a WAV anyway — strip the
+                        # header once rather than playing it
+                        if first_chunk:
+                            first_chunk = False
+                            wav_pending = chunk[:4] == b'RIFF'
+                        if wav_pending:
+                            audio_buffer.extend(chunk)
+                            parsed = self._parse_wav_header(audio_buffer)
+                            if parsed is None:
+                                continue
+                            kokoro_sample_rate, data_off = parsed
+                            chunk = bytes(audio_buffer[data_off:])
+                            audio_buffer.clear()
+                            wav_pending = False
+                            if not chunk:
+                                continue
+
+                        # Coalesce into frame-sized pieces instead
+                        # of yielding once per TCP read. If the
+                        # server paused, flush the partial buffer
+                        # first so audio doesn't sit here.
+                        now = loop.time()
+                        if emit_buf and now - last_emit > 0.1:
+                            yield TTSAudioRawFrame(
+                                audio=bytes(emit_buf),
+                                sample_rate=kokoro_sample_rate,
+                                num_channels=1
+                            )
+                            emit_buf.clear()
+                        emit_buf.extend(chunk)
+                        # Slice complete frames through one memoryview
+                        # (no intermediate bytearray copy per frame) and
+                        # trim the buffer once, not per frame
+                        n_full = len(emit_buf) - len(emit_buf) % self._emit_target
+                        if n_full:
+                            with memoryview(emit_buf) as mv:
+                                frames = [
+                                    bytes(mv[off:off + self._emit_target])
+                                    for off in range(0, n_full, self._emit_target)
+                                ]
+                            del emit_buf[:n_full]
+                            for audio in frames:
+                                yield TTSAudioRawFrame(
+                                    audio=audio,
+                                    sample_rate=kokoro_sample_rate,
                                     num_channels=1
                                 )
-                                yield frame
-                                    
-                                self._audio_buffer = b""
-                    
-                    # Process any remaining buffer data
-                    if self._audio_buffer:
-                        logger.info(f"Processing final buffer: {len(self._audio_buffer)} bytes")
-                        try:
-                            # Use raw buffer data at native sample rate
-                            frame = TTSAudioRawFrame(
-                                audio=self._audio_buffer,
+                            last_emit = now
+                finally:
+                    if not pump.done():
+                        pump.cancel()
+
+                # Flush whatever the coalescer is still holding
+                if emit_buf:
+                    yield TTSAudioRawFrame(
+                        audio=bytes(emit_buf),
+                        sample_rate=kokoro_sample_rate,
+                        num_channels=1
+                    )
+                    emit_buf.clear()
+
+                # Stream ended before a sniffed WAV header resolved;
+                # emit the accumulation as raw PCM in frame-sized
+                # slices rather than one oversized frame that would
+                # defeat downstream playback pacing
+                if audio_buffer:
+                    logger.info("Processing final buffer: %d bytes", len(audio_buffer))
+                    # One memoryview over the buffer; each frame is a
+                    # single copy out of the view. Released before
+                    # clear(), which a live export would reject.
+                    mv = memoryview(audio_buffer)
+                    try:
+                        for off in range(0, len(mv), self._emit_target):
+                            yield TTSAudioRawFrame(
+                                audio=bytes(mv[off:off + self._emit_target]),
                                 sample_rate=kokoro_sample_rate,
                                 num_channels=1
                             )
-                            yield frame
-                        except Exception as e:
-                            logger.warning(f"Failed to process final buffer: {e}")
+                    finally:
+                        mv.release()
+                    audio_buffer.clear()
             finally:
                 self._current_request = None
+                await self._close_quietly(response)
                         
         except asyncio.CancelledError:
             logger.info("TTS request cancelled")
             if self._current_request:
-                try:
-                    await self._current_request.aclose()
-                except:
-                    pass
+                await self._close_quietly(self._current_request)
                 self._current_request = None
             raise
         except Exception as e:
             logger.error(f"Kokoro TTS error: {e}")
             if self._current_request:
-                try:
-                    await self._current_request.aclose()
-                except:
-                    pass
+                await self._close_quietly(self._current_request)
                 self._current_request = None
             raise
             
@@ -249,11 +332,12 @@ class KokoroTTSService(TTSService):
         # Cancel any ongoing request
         if self._current_request:
             logger.info("Stopping TTS service, cancelling ongoing request")
-            try:
-                await self._current_request.aclose()
-            except:
-                pass
+            await self._close_quietly(self._current_request)
             self._current_request = None
             
+        # Let background closes from earlier cancellations finish
+        if self._pending_closes:
+            await asyncio.gather(*self._pending_closes, return_exceptions=True)
+
         await super().stop()
-        await self._client.aclose()
+        # The pooled client is shared across instances; leave it open
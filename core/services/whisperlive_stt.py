@@ -131,7 +131,7 @@ class WhisperLiveSTTService(STTService):
         """Handle WhisperLive messages"""
         # Check if message is for our client
         if "uid" in data and data["uid"] != self._client_uid:
-            logger.debug(f"Ignoring message for different client: {data['uid']}")
+            logger.debug("Ignoring message for different client: %s", data["uid"])
             return
             
         # Handle segments (main transcription format)
@@ -246,7 +246,7 @@ class WhisperLiveSTTService(STTService):
         """Process incoming frames"""
         # Log non-audio frames only
         if not isinstance(frame, (AudioRawFrame, InputAudioRawFrame, UserAudioRawFrame)):
-            logger.debug(f"STT process_frame: {type(frame).__name__}, direction: {direction}")
+            logger.debug("STT process_frame: %s, direction: %s", type(frame).__name__, direction)
         
         await super().process_frame(frame, direction)
         
@@ -267,7 +267,8 @@ class WhisperLiveSTTService(STTService):
             silence_threshold = 2000  # Much higher threshold to prevent hallucinations
             
             if max_amplitude > silence_threshold:
-                logger.debug(f"Audio: {len(frame.audio)} bytes, max_amplitude: {max_amplitude}, non_zero: {non_zero_samples}/{len(audio_samples)}")
+                logger.debug("Audio: %d bytes, max_amplitude: %d, non_zero: %d/%d",
+                             len(frame.audio), max_amplitude, non_zero_samples, len(audio_samples))
                 
                 # Add audio to buffer only if it contains speech
                 self._audio_buffer.extend(frame.audio)
@@ -284,26 +285,28 @@ class WhisperLiveSTTService(STTService):
                         # Convert int16 to float32 range [-1.0, 1.0] like maestro
                         audio_samples_float32 = audio_samples_int16.astype(np.float32) / 32768.0
                         chunk = audio_samples_float32.tobytes()
-                        logger.debug(f"Converted audio chunk: {len(audio_samples_int16)} int16 -> {len(audio_samples_float32)} float32")
+                        logger.debug("Converted audio chunk: %d int16 -> %d float32",
+                                     len(audio_samples_int16), len(audio_samples_float32))
                     else:
                         chunk = bytes(chunk_data)
                     
                     if self._websocket and not self._websocket.closed:
                         try:
                             await self._websocket.send(chunk)
-                            logger.debug(f"Sent audio chunk: {len(chunk)} bytes, buffer remaining: {len(self._audio_buffer)}")
+                            logger.debug("Sent audio chunk: %d bytes, buffer remaining: %d",
+                                         len(chunk), len(self._audio_buffer))
                         except Exception as e:
                             logger.error(f"Error sending audio to WhisperLive: {e}")
                     else:
                         logger.warning(f"WebSocket not available for sending audio chunk")
             else:
                 # For silence, just discard the audio to avoid overwhelming WhisperLive
-                logger.debug(f"Silence detected (max_amplitude: {max_amplitude}), discarding audio")
+                logger.debug("Silence detected (max_amplitude: %d), discarding audio", max_amplitude)
                         
             # Pass the frame downstream
             await self.push_frame(frame, direction)
         else:
-            logger.debug(f"Non-audio frame: {type(frame).__name__}")
+            logger.debug("Non-audio frame: %s", type(frame).__name__)
             # Pass non-audio frames downstream
             await self.push_frame(frame, direction)
             
@@ -1,7 +1,7 @@
 # maestrocat/utils/config.py
 """Configuration management for MaestroCat"""
 from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 import yaml
 import os
 
@@ -58,7 +58,26 @@ class MaestroCatConfig:
         self.tts = TTSConfig(**config_dict.get("tts", {}))
         self.interruption = InterruptionConfig(**config_dict.get("interruption", {}))
         self.modules = config_dict.get("modules", {})
-        
+        self._dict_cache: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary (cached; config rarely changes)"""
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "vad": asdict(self.vad),
+                "stt": asdict(self.stt),
+                "llm": asdict(self.llm),
+                "tts": asdict(self.tts),
+                "interruption": asdict(self.interruption),
+                "modules": self.modules
+            }
+        return self._dict_cache
+
+    def invalidate_cache(self):
+        """Drop the cached dict after mutating config in place"""
+        self._dict_cache = None
+
+
     @classmethod
     def from_file(cls, file_path: str) -> "MaestroCatConfig":
         """Load configuration from YAML file"""
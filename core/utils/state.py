@@ -5,14 +5,28 @@ from dataclasses import dataclass, field
 import time
 
 
-@dataclass
+@dataclass(slots=True)
 class Turn:
     """A single conversation turn"""
     speaker: str  # "user" or "assistant"
     text: str
     timestamp: float
     metadata: Dict[str, Any] = field(default_factory=dict)
-    
+    # Cached dict form; turns are never mutated after being added
+    _as_dict: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary (cached after the first call)"""
+        if self._as_dict is None:
+            self._as_dict = {
+                "speaker": self.speaker,
+                "text": self.text,
+                "timestamp": self.timestamp,
+                "metadata": self.metadata
+            }
+        return self._as_dict
+
+
 
 @dataclass
 class ConversationState:
@@ -43,15 +57,7 @@ class ConversationState:
         """Convert to dictionary"""
         return {
             "session_id": self.session_id,
-            "turns": [
-                {
-                    "speaker": t.speaker,
-                    "text": t.text,
-                    "timestamp": t.timestamp,
-                    "metadata": t.metadata
-                }
-                for t in self.turns
-            ],
+            "turns": [t.to_dict() for t in self.turns],
             "current_speaker": self.current_speaker,
             "user_profile": self.user_profile,
             "context": self.context
@@ -11,6 +11,14 @@ import logging
 import os
 from typing import Optional
 
+# uvloop's C event loop cuts scheduler overhead on the audio streaming
+# paths; the default loop works fine when it isn't installed
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 # FastAPI imports
 from fastapi import FastAPI, WebSocket
 import uvicorn
@@ -4,6 +4,14 @@ import logging
 import os
 from dotenv import load_dotenv
 
+# uvloop's C event loop cuts scheduler overhead on the audio streaming
+# paths; the default loop works fine when it isn't installed
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineTask
@@ -37,7 +37,7 @@ setup(
     ],
     extras_require={
         "whisperlive": ["pyaudio>=0.2.11"],
-        "debug": ["prometheus-client>=0.18.0", "psutil>=5.9.0"],
+        "debug": ["prometheus-client>=0.18.0", "psutil>=5.9.0", "orjson>=3.9.0"],
         "dev": [
             "pytest>=7.4.0",
             "pytest-asyncio>=0.21.0",
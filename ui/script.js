@@ -19,15 +19,19 @@ class MaestroCatDebugUI {
   connect() {
     // Try to connect to the WebSocket
     this.ws = new WebSocket(`ws://${window.location.hostname}:8080/ws`);
-    
+    // The server sends binary frames; without this they arrive as Blobs
+    this.ws.binaryType = 'arraybuffer';
+
     this.ws.onopen = () => {
       console.log('Connected to MaestroCat Debug UI');
       this.updateConnectionStatus(true);
     };
-    
+
     this.ws.onmessage = (event) => {
-      const data = JSON.parse(event.data);
-      this.handleMessage(data);
+      const text = typeof event.data === 'string'
+        ? event.data
+        : new TextDecoder().decode(event.data);
+      this.handleMessage(JSON.parse(text));
     };
     
     this.ws.onclose = () => {
@@ -53,9 +57,16 @@ class MaestroCatDebugUI {
       case 'event':
         this.handleEvent(data.event);
         break;
+      case 'batch':
+        data.events.forEach(event => this.handleEvent(event));
+        break;
       case 'initial_state':
         this.updateUI(data);
         break;
+      case 'initial_metrics':
+        // Replay history chunks; the gauges end up showing the newest
+        data.metrics.forEach(entry => this.updateMetrics(entry.data));
+        break;
     }
   }
 